@@ -1,9 +1,45 @@
+import calendar
 import random
-from datetime import datetime, timedelta
-import codecs
+import time
+from collections import Counter
+from datetime import datetime
 import os
 import shutil
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if np is not None and njit is not None:
+    @njit(cache=True)
+    def _draw_indices_numba(count, seed, total_seconds, table_sizes):
+        # Integer draws only; Numba's nopython mode does not cover the
+        # string formatting, which stays in Python. The loop stays
+        # serial: under parallel=True each thread has its own RNG state
+        # and only the calling thread's would be seeded, breaking the
+        # module's reproducibility guarantee.
+        np.random.seed(seed)
+        out = np.empty((count, 3 + len(table_sizes)), np.int64)
+        for i in range(count):
+            out[i, 0] = np.random.randint(0, total_seconds)
+            out[i, 1] = np.random.randint(0, 1000)
+            out[i, 2] = np.random.randint(1000, 10000)
+            for j in range(len(table_sizes)):
+                out[i, 3 + j] = np.random.randint(0, table_sizes[j])
+        return out
+
+# One RNG instance for the whole module, bound once instead of going
+# through the random module's global instance on every call; seeded so
+# repeated runs produce the same tree of log files.
+_rng = random.Random(0xC0FFEE)
+_np_rng = np.random.default_rng(0xC0FFEE) if np is not None else None
+
 # Add time periods
 TIME_PERIODS = {
     'ancient': {
@@ -44,39 +80,112 @@ TIME_PERIODS = {
     }
 }
 
-def generate_log_entry():
-    log_levels = ['INFO', 'WARNING', 'ERROR', 'DEBUG', 'CRITICAL']
-    status = ['SUCCESS', 'FAILED', 'IN_PROGRESS', 'TIMEOUT', 'RETRY']
-    
-    # Select random time period
-    period_name, period = random.choice(list(TIME_PERIODS.items()))
-    
-    # Generate timestamp within the selected period
-    start_date = datetime(period['start_year'], 1, 1)
-    end_date = datetime(period['end_year'], 12, 31)
-    time_delta = end_date - start_date
-    random_days = random.randrange(time_delta.days)
-    timestamp = start_date + timedelta(
-        days=random_days,
-        hours=random.randint(0, 23),
-        minutes=random.randint(0, 59),
-        seconds=random.randint(0, 59)
-    )
-    
-    message = random.choice(period['messages']).format(
-        random.choice(status),
-        f"unit_{random.randint(1000, 9999)}" if "{}" in random.choice(period['messages']) else ""
-    )
-    
-    return f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}] {random.choice(log_levels)} [{random.choice(period['components'])}] [{random.choice(period['operations'])}] - {message}"
+LOG_LEVELS = ['INFO', 'WARNING', 'ERROR', 'DEBUG', 'CRITICAL']
+STATUS = ['SUCCESS', 'FAILED', 'IN_PROGRESS', 'TIMEOUT', 'RETRY']
+
+def _generate_period_batch(rng, period, count):
+    # Draw every random field for the whole batch at once; the per-entry
+    # work left in Python is a single f-string per line.
+    start = np.datetime64(f"{period['start_year']}-01-01", 's')
+    end = np.datetime64(f"{period['end_year']}-12-31", 's')
+    total_seconds = int((end - start) / np.timedelta64(1, 's'))
+    tables = [LOG_LEVELS, period['components'], period['operations'],
+              period['messages'], STATUS]
+    if njit is not None:
+        table_sizes = np.array([len(table) for table in tables], np.int64)
+        drawn = _draw_indices_numba(count, int(rng.integers(0, 2**31)),
+                                    total_seconds, table_sizes)
+        offsets, millis, units = drawn[:, 0], drawn[:, 1], drawn[:, 2]
+        table_indices = [drawn[:, 3 + j] for j in range(len(tables))]
+    else:
+        offsets = rng.integers(0, total_seconds, count)
+        millis = rng.integers(0, 1000, count)
+        units = rng.integers(1000, 10000, count)
+        table_indices = [rng.integers(0, len(table), count) for table in tables]
+    stamps = start + offsets.astype('timedelta64[s]')
+    stamps = stamps.astype('datetime64[ms]') + millis.astype('timedelta64[ms]')
+    stamps = np.datetime_as_string(stamps, unit='ms')
+    levels, components, operations, messages, statuses = (
+        np.array(table)[indices] for table, indices in zip(tables, table_indices))
+    return [
+        f"[{ts.replace('T', ' ')}] {level} [{component}] [{operation}] - "
+        + message.format(status, f"unit_{unit}") + '\n'
+        for ts, level, component, operation, message, status, unit
+        in zip(stamps, levels, components, operations, messages, statuses, units)
+    ]
+
+def _generate_period_batch_python(period, count):
+    # _rng.choices(..., k=count) drives the RNG in one C-level loop per
+    # field instead of one Python-level call per entry.
+    start_epoch = calendar.timegm((period['start_year'], 1, 1, 0, 0, 0))
+    end_epoch = calendar.timegm((period['end_year'], 12, 31, 0, 0, 0))
+    offsets = _rng.choices(range(end_epoch - start_epoch), k=count)
+    millis = _rng.choices(range(1000), k=count)
+    levels = _rng.choices(LOG_LEVELS, k=count)
+    components = _rng.choices(period['components'], k=count)
+    operations = _rng.choices(period['operations'], k=count)
+    messages = _rng.choices(period['messages'], k=count)
+    statuses = _rng.choices(STATUS, k=count)
+    units = _rng.choices(range(1000, 10000), k=count)
+    lines = []
+    for offset, ms, level, component, operation, message, status, unit in zip(
+            offsets, millis, levels, components, operations, messages, statuses, units):
+        # The format is fixed, so a plain f-string over gmtime fields beats
+        # building a datetime and going through strftime for every entry.
+        tm = time.gmtime(start_epoch + offset)
+        lines.append(
+            f"[{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d} "
+            f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}.{ms:03d}] "
+            f"{level} [{component}] [{operation}] - "
+            + message.format(status, f"unit_{unit}") + '\n')
+    return lines
+
+def generate_log_entries(num_entries):
+    if np is None:
+        counts = Counter(_rng.choices(list(TIME_PERIODS), k=num_entries))
+        lines = []
+        for period_name, count in counts.items():
+            lines.extend(_generate_period_batch_python(TIME_PERIODS[period_name], count))
+        _rng.shuffle(lines)
+        return lines
+    rng = _np_rng
+    periods = list(TIME_PERIODS.values())
+    counts = rng.multinomial(num_entries, [1.0 / len(periods)] * len(periods))
+    lines = []
+    for period, count in zip(periods, counts):
+        if count:
+            lines.extend(_generate_period_batch(rng, period, int(count)))
+    _rng.shuffle(lines)
+    return lines
 
 def create_log_file(filepath, min_entries, max_entries):
-    num_entries = random.randint(min_entries, max_entries)
-    with codecs.open(filepath, 'w', encoding='utf-16') as f:
-        for _ in range(num_entries):
-            f.write(generate_log_entry() + '\n')
+    num_entries = _rng.randint(min_entries, max_entries)
+    # UTF-8 halves bytes on disk versus the old UTF-16 stream for this
+    # ASCII content, which also halves the read/hash cost downstream.
+    # Join and encode once so the file is written with a single call;
+    # the buffered default handles any short writes for us.
+    data = ''.join(generate_log_entries(num_entries)).encode('utf-8')
+    with open(filepath, 'wb') as f:
+        f.write(data)
     return filepath
 
+def fast_copy(src, dst):
+    # In-kernel copy (a reflink on supporting filesystems) avoids pulling
+    # the file bytes through user space; metadata is still preserved so
+    # duplicates keep matching mtimes.
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):
+        shutil.copy2(src, dst)
+    return dst
+
 def create_directory_structure(base_path):
     # Define the directory structure with time machine components
     structure = {
@@ -86,12 +195,21 @@ def create_directory_structure(base_path):
     }
     
     # Create directories and return their paths
-    paths = []
-    for sector, devices in structure.items():
-        for device in devices:
-            path = os.path.join(base_path, sector, device, 'temporal_logs')
-            os.makedirs(path, exist_ok=True)
-            paths.append(path)
+    paths = [os.path.join(base_path, sector, device, 'temporal_logs')
+             for sector, devices in structure.items()
+             for device in devices]
+    # os.makedirs re-walks shared parents for every leaf; issue one mkdir
+    # per unique directory instead, parents before children.
+    all_dirs = set()
+    for path in paths:
+        while path and path not in all_dirs:
+            all_dirs.add(path)
+            path = os.path.dirname(path)
+    for directory in sorted(all_dirs, key=lambda p: p.count(os.sep)):
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            pass
     return paths
 
 def main():
@@ -126,13 +244,13 @@ def main():
     for dir_path in log_dirs[1:]:
         # Duplicate some files (30% chance for each file)
         for filename, source_path in original_files:
-            if random.random() < 0.3:
+            if _rng.random() < 0.3:
                 target_path = os.path.join(dir_path, filename)
-                shutil.copy2(source_path, target_path)
+                fast_copy(source_path, target_path)
                 print(f"Duplicated: {target_path}")
         
         # Create some unique files
-        unique_name = f"temporal_anomaly_{os.path.basename(dir_path)}_{random.randint(1000,9999)}.log"
+        unique_name = f"temporal_anomaly_{os.path.basename(dir_path)}_{_rng.randint(1000,9999)}.log"
         unique_path = os.path.join(dir_path, unique_name)
         create_log_file(unique_path, 100, 400)
         print(f"Created unique: {unique_path}")